@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Country, DailyMetric, PolicyDaily, PolicyEvent
+from .models import Country, DailyMetric, Highlight, PolicyDaily, PolicyEvent
 
 @admin.register(Country)
 class CountryAdmin(admin.ModelAdmin):
@@ -23,3 +23,9 @@ class PolicyEventAdmin(admin.ModelAdmin):
     list_display = ("country", "date", "text")
     list_filter = ("country",)
     date_hierarchy = "date"
+
+@admin.register(Highlight)
+class HighlightAdmin(admin.ModelAdmin):
+    list_display = ("country", "date", "type", "title")
+    list_filter = ("type", "country")
+    date_hierarchy = "date"
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from datetime import date
+from itertools import accumulate
+from operator import attrgetter, itemgetter
+from typing import List, NamedTuple, Optional
+
+from django.db import transaction
+
+from .models import Country, Highlight
+from .timeseries import POLICY_FIELDS, POLICY_KEYS, POLICY_LABELS, TIMESERIES_COLUMNS, timeseries_rows
+
+POLICY_LABELS_TUPLE = tuple(POLICY_LABELS[k] for k in POLICY_KEYS)
+
+_POLICY_ID = TIMESERIES_COLUMNS.index("policy_id")
+
+# (stringency_index, *POLICY_KEYS) of a timeseries row
+_policy_snapshot = itemgetter(*(TIMESERIES_COLUMNS.index(f) for f in POLICY_FIELDS))
+
+
+class DetectedHighlight(NamedTuple):
+    """A highlight found by detect_highlights, before it is stored as a Highlight row."""
+
+    date: date
+    type: str
+    title: str
+    details: List[str]
+
+
+def detect_highlights(rows: List[tuple]) -> List[DetectedHighlight]:
+    """
+    Auto "pause points" for one country's aligned metric/policy rows (see timeseries.timeseries_rows),
+    de-duplicated per (date, type, title) and ordered by date.
+    """
+    dates: List[date] = [r[0] for r in rows]
+    highlights: List[DetectedHighlight] = []
+
+    # 1) Policy highlights: big stringency shifts or any ordinal indicator changes.
+    # Each policy day is snapshotted once as (stringency, *ordinals); unchanged days are one tuple compare.
+    prev_p: Optional[tuple] = None
+    for d, r in zip(dates, rows):
+        if r[_POLICY_ID] is None:
+            prev_p = None
+            continue
+        cur = _policy_snapshot(r)
+
+        if prev_p is not None and prev_p != cur:
+            s0, s1 = prev_p[0], cur[0]
+            if s0 is not None and s1 is not None and abs(float(s1) - float(s0)) >= 10:
+                direction = "tightened" if float(s1) > float(s0) else "relaxed"
+                highlights.append(
+                    DetectedHighlight(
+                        date=d,
+                        type="policy",
+                        title=f"Policy stringency {direction}",
+                        details=[f"Stringency: {float(s0):.1f} → {float(s1):.1f} (Δ {float(s1)-float(s0):+.1f})"],
+                    )
+                )
+
+            for label, a, b in zip(POLICY_LABELS_TUPLE, prev_p[1:], cur[1:]):
+                if a != b:
+                    highlights.append(
+                        DetectedHighlight(
+                            date=d,
+                            type="policy",
+                            title=f"{label} changed",
+                            details=[f"{label}: {a} → {b}"],
+                        )
+                    )
+
+        prev_p = cur
+
+    # 2) Case/death acceleration highlights (7d avg vs previous 7d avg)
+    def _add_accel(metric: str, h_type: str, title_prefix: str, min_baseline: float):
+        col = TIMESERIES_COLUMNS.index(metric)
+        vals = [r[col] for r in rows]
+        if not vals:
+            return
+        # 7-day mean ending on each day (None with fewer than 5 reported days). The "prior week"
+        # for day i is just the window ending on i - 7, so every window is averaged once, not twice.
+        # Prefix sums/counts of the reported values make each window O(1): sums[i + 1] - sums[i - 6].
+        sums = list(accumulate((0.0 if v is None else v for v in vals), initial=0.0))
+        counts = list(accumulate((v is not None for v in vals), initial=0))
+        avg7: List[Optional[float]] = [None] * len(vals)
+        for i in range(6, len(vals)):
+            reported = counts[i + 1] - counts[i - 6]
+            if reported >= 5:
+                avg7[i] = (sums[i + 1] - sums[i - 6]) / reported
+
+        for i in range(14, len(vals)):
+            cur_avg, prev_avg = avg7[i], avg7[i - 7]
+            if cur_avg is None or prev_avg is None:
+                continue
+            if prev_avg < min_baseline:
+                continue
+            ratio = (cur_avg / prev_avg) if prev_avg else 0
+            if ratio >= 1.5:
+                highlights.append(
+                    DetectedHighlight(
+                        date=dates[i],
+                        type=h_type,
+                        title=f"{title_prefix} accelerating",
+                        details=[f"7d avg rose {ratio:.2f}× vs prior week ({prev_avg:.1f} → {cur_avg:.1f})."],
+                    )
+                )
+
+    _add_accel("new_cases_smoothed", "cases", "Cases", min_baseline=50)
+    _add_accel("new_deaths_smoothed", "deaths", "Deaths", min_baseline=2)
+
+    # 3) Vaccination milestones: the first reported day at or above each threshold, after a reported
+    # day below it. Reporting has gaps and the odd downward revision, so each threshold is found by
+    # bisecting the running maximum of the reported values, which is sorted.
+    vax_col = TIMESERIES_COLUMNS.index("people_fully_vaccinated_per_hundred")
+    reported = [i for i, r in enumerate(rows) if r[vax_col] is not None]
+    peaks = list(accumulate((float(rows[i][vax_col]) for i in reported), max))
+    for thr in (10, 25, 50, 70, 80):
+        j = bisect_left(peaks, thr)
+        if 0 < j < len(peaks):
+            highlights.append(
+                DetectedHighlight(
+                    date=dates[reported[j]],
+                    type="vax",
+                    title=f"Vaccination milestone: {thr}% fully vaccinated",
+                    details=[f"People fully vaccinated reached ≥{thr}%."],
+                )
+            )
+
+    # De-duplicate highlights that might repeat on the same day
+    seen = set()
+    unique: List[DetectedHighlight] = []
+    for h in highlights:
+        key = (h.date, h.type, h.title)
+        if key not in seen:
+            seen.add(key)
+            unique.append(h)
+    # Each detector above emits in date order, so this stable sort only merges a few sorted runs
+    unique.sort(key=attrgetter("date"))
+    return unique
+
+
+@transaction.atomic
+def compute_highlights(country: Country) -> int:
+    """
+    Replace the country's stored highlights with those detected over its whole history.
+    Returns the number of highlights written.
+    """
+    found = detect_highlights(timeseries_rows(country))
+    Highlight.objects.filter(country=country).delete()
+    Highlight.objects.bulk_create([Highlight(country=country, **h._asdict()) for h in found], batch_size=1000)
+    return len(found)
+
+
+def refresh_highlights(countries: List[Country]) -> int:
+    """
+    Replace the stored highlights of every given country after an import. Imports upsert the whole
+    history, so a revised value on any day can change highlights anywhere; there is no safe tail.
+    """
+    return sum(compute_highlights(country) for country in countries)
@@ -1,15 +1,24 @@
 import csv
 import io
-from datetime import datetime
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, List, Optional
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db import connection, transaction
 
+from dashboard.highlights import refresh_highlights
 from dashboard.models import Country, DailyMetric, PolicyDaily, PolicyEvent
+from dashboard.timeseries import warm_api_cache
 
 
 OWID_URL = "https://raw.githubusercontent.com/owid/covid-19-data/master/public/data/owid-covid-data.csv"
@@ -24,49 +33,194 @@ OXCGRT_URLS = [
 
 CACHE_DIR = Path(getattr(settings, "BASE_DIR", Path.cwd())) / "data_cache"
 
+# One pooled session for all downloads: OWID and OxCGRT both live on raw.githubusercontent.com,
+# so fallbacks and retries reuse the open TCP/TLS connection instead of handshaking again.
+_session = requests.Session()
+_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504)),
+    ),
+)
+
+# Rows are buffered and upserted in batches instead of one update_or_create per row.
+UPSERT_BATCH_SIZE = 5000
+
+# DailyMetric field -> OWID CSV column
+OWID_METRIC_COLUMNS = {
+    "new_cases_smoothed": "new_cases_smoothed",
+    "new_deaths_smoothed": "new_deaths_smoothed",
+    "total_cases": "total_cases",
+    "total_deaths": "total_deaths",
+    "cases_per_million": "new_cases_smoothed_per_million",
+    "deaths_per_million": "new_deaths_smoothed_per_million",
+    "total_vaccinations_per_hundred": "total_vaccinations_per_hundred",
+    "people_fully_vaccinated_per_hundred": "people_fully_vaccinated_per_hundred",
+}
+
+# PolicyDaily field -> accepted OxCGRT column names (header differs between exports)
+OXCGRT_POLICY_COLUMNS = {
+    "stringency_index": ("StringencyIndex", "stringency_index"),
+    "c1_school_closing": ("C1_School closing", "c1_school_closing", "C1_School_Closing"),
+    "c2_workplace_closing": ("C2_Workplace closing", "c2_workplace_closing", "C2_Workplace_Closing"),
+    "c6_stay_at_home": ("C6_Stay at home requirements", "c6_stay_at_home", "C6_Stay_at_home_requirements"),
+    "c8_international_travel_controls": ("C8_International travel controls", "c8_international_travel_controls", "C8_International_travel_controls"),
+    "h6_facial_coverings": ("H6_Facial Coverings", "h6_facial_coverings", "H6_Facial_Coverings"),
+}
+
+# PolicyDaily field -> (event label, minimum change worth an event)
+POLICY_EVENT_FIELDS = {
+    "stringency_index": ("Stringency", 2.0),
+    "c1_school_closing": ("School closing", 0.0),
+    "c2_workplace_closing": ("Workplace closing", 0.0),
+    "c6_stay_at_home": ("Stay-at-home", 0.0),
+    "c8_international_travel_controls": ("Intl travel", 0.0),
+    "h6_facial_coverings": ("Face coverings", 0.0),
+}
+
 
 def _to_float(x) -> Optional[float]:
+    # Called for every numeric cell: empty strings (the common case) short-circuit without raising
+    if not x:
+        return None
     try:
-        if x is None or x == "":
-            return None
         return float(x)
-    except Exception:
+    except (TypeError, ValueError):
         return None
 
 
 def _to_int(x) -> Optional[int]:
+    if not x:
+        return None
+    try:
+        return int(x)
+    except ValueError:
+        pass
     try:
-        if x is None or x == "":
-            return None
         return int(float(x))
-    except Exception:
+    except (TypeError, ValueError, OverflowError):
         return None
 
 
-def _parse_date(s: str):
+@lru_cache(maxsize=4096)
+def _parse_date(s: str) -> Optional[date]:
     """
     Accepts:
     - YYYY-MM-DD (OWID)
     - YYYYMMDD (OxCGRT)
     - YYYY-MM-DD (some OxCGRT exports)
+
+    The fixed layouts are sliced by hand (strptime is slow per row), and results are
+    cached since every date string repeats once per country.
     """
     s = (s or "").strip()
     if not s:
         return None
+    if len(s) == 10 and s[4] == "-" and s[7] == "-":
+        return date(int(s[0:4]), int(s[5:7]), int(s[8:10]))
     if "-" in s:
         return datetime.strptime(s, "%Y-%m-%d").date()
     if len(s) == 8:
-        return datetime.strptime(s, "%Y%m%d").date()
+        return date(int(s[0:4]), int(s[4:6]), int(s[6:8]))
+    return None
+
+
+def _diff(label: str, a, b, float_threshold: float = 0.0) -> Optional[str]:
+    """Event text for one indicator moving from `a` to `b`, or None if it did not (meaningfully) change."""
+    if a == b:
+        return None
+    if a is None and b is None:
+        return None
+    if float_threshold and a is not None and b is not None:
+        try:
+            if abs(float(b) - float(a)) < float_threshold:
+                return None
+        except Exception:
+            pass
+    return f"{label}: {a} → {b}"
+
+
+def _column_index(header: List[str], *names: str) -> Optional[int]:
+    """Position of the first of `names` present in the CSV header (None if absent)."""
+    for name in names:
+        if name in header:
+            return header.index(name)
     return None
 
 
-def _download_text(urls: List[str], timeout: int) -> str:
+def _cell_getter(indices: List[int]) -> Callable[[List[str]], Tuple[str, ...]]:
+    """Like operator.itemgetter, but always returns a tuple (also for zero or one index)."""
+    if len(indices) >= 2:
+        return itemgetter(*indices)
+    return lambda row: tuple(row[i] for i in indices)
+
+
+def _upsert_rows(model, fields: List[str], rows: List[tuple]):
+    """
+    Upsert plain (country_id, date, *fields) tuples with one executemany call.
+
+    Bypasses model instantiation, validation and signals entirely; the statement is
+    INSERT ... ON CONFLICT (country_id, date) DO UPDATE, which SQLite and PostgreSQL share.
+    With no `fields` (a CSV without any of the value columns) existing days are left as they are.
+    """
+    if not rows:
+        return
+    meta = model._meta
+    qn = connection.ops.quote_name
+    columns = ["country_id", "date"] + [meta.get_field(f).column for f in fields]
+    if fields:
+        on_conflict = "DO UPDATE SET " + ", ".join(f"{qn(c)} = EXCLUDED.{qn(c)}" for c in columns[2:])
+    else:
+        on_conflict = "DO NOTHING"
+    sql = (
+        f"INSERT INTO {qn(meta.db_table)} ({', '.join(qn(c) for c in columns)}) "
+        f"VALUES ({', '.join(['%s'] * len(columns))}) "
+        f"ON CONFLICT ({qn('country_id')}, {qn('date')}) {on_conflict}"
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def _insert_rows(model, fields: List[str], rows: List[tuple]):
+    """Plain INSERT of parameter tuples with one executemany call; the bulk-load path for append-only tables."""
+    if not rows:
+        return
+    meta = model._meta
+    qn = connection.ops.quote_name
+    columns = [meta.get_field(f).column for f in fields]
+    sql = (
+        f"INSERT INTO {qn(meta.db_table)} ({', '.join(qn(c) for c in columns)}) "
+        f"VALUES ({', '.join(['%s'] * len(columns))})"
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def _create_countries(pending: List[Country]):
+    """Insert countries first seen during an import in one query and fill in their primary keys."""
+    if not pending:
+        return
+    Country.objects.bulk_create(pending, ignore_conflicts=True)
+    ids = dict(Country.objects.filter(iso_code__in=[c.iso_code for c in pending]).values_list("iso_code", "id"))
+    for c in pending:
+        c.id = ids[c.iso_code]
+    pending.clear()
+
+
+def _open_stream(urls: List[str], timeout: int) -> requests.Response:
+    """Open a streaming response for the first URL that answers; the body is read lazily from `resp.raw`."""
     last_err = None
     for url in urls:
         try:
-            resp = requests.get(url, timeout=timeout)
+            resp = _session.get(url, stream=True, timeout=timeout)
+            if not resp.ok:
+                # Hand the pooled connection back before trying the next URL
+                resp.close()
             resp.raise_for_status()
-            return resp.text
+            resp.raw.decode_content = True
+            return resp
         except Exception as e:
             last_err = e
     raise RuntimeError(f"All download attempts failed. Last error: {last_err}")
@@ -97,34 +251,45 @@ class Command(BaseCommand):
         use_cache = not opts["no_cache"]
         force = bool(opts["force_download"])
 
+        sources = []
         if do_owid:
-            self.stdout.write("OWID: preparing data...")
-            owid_text = self._get_cached_or_download(
-                "owid-covid-data.csv",
-                [OWID_URL],
-                timeout=opts["timeout"],
-                use_cache=use_cache,
-                force=force,
-                skip_download=bool(opts["skip_download_owid"]),
-            )
-            self.import_owid(owid_text, limit_countries=opts["limit_countries"])
-
+            sources.append(("OWID", "owid-covid-data.csv", [OWID_URL], bool(opts["skip_download_owid"]), self.import_owid))
         if do_oxcgrt:
-            self.stdout.write("OxCGRT: preparing data...")
-            oxcgrt_text = self._get_cached_or_download(
-                "oxcgrt-latest.csv",
-                OXCGRT_URLS,
-                timeout=opts["timeout"],
-                use_cache=use_cache,
-                force=force,
-                skip_download=bool(opts["skip_download_oxcgrt"]),
-            )
-            self.import_oxcgrt(oxcgrt_text, limit_countries=opts["limit_countries"])
+            sources.append(("OxCGRT", "oxcgrt-latest.csv", OXCGRT_URLS, bool(opts["skip_download_oxcgrt"]), self.import_oxcgrt))
+
+        # Downloads are network-bound and independent, so they run side by side (OWID can already be
+        # importing while OxCGRT is still downloading); the imports themselves stay sequential.
+        with ThreadPoolExecutor(max_workers=max(1, len(sources))) as pool:
+            futures = [
+                pool.submit(
+                    self._prepare_source,
+                    label,
+                    cache_name,
+                    urls,
+                    timeout=opts["timeout"],
+                    use_cache=use_cache,
+                    force=force,
+                    skip_download=skip_download,
+                )
+                for label, cache_name, urls, skip_download, _ in sources
+            ]
+            for (_, _, urls, _, importer), future in zip(sources, futures):
+                with self._open_source(future.result(), urls, timeout=opts["timeout"]) as csv_file:
+                    importer(csv_file, limit_countries=opts["limit_countries"])
+
+        self.stdout.write("Refreshing highlights...")
+        written = refresh_highlights(list(Country.objects.order_by("name")))
+        self.stdout.write(f"  highlights written: {written}")
+
+        # Pre-render the API responses so no visitor pays for the first build after new data
+        self.stdout.write("Warming API cache...")
+        self.stdout.write(f"  cached: {warm_api_cache()} countries")
 
         self.stdout.write(self.style.SUCCESS("Done."))
 
-    def _get_cached_or_download(
+    def _prepare_source(
         self,
+        label: str,
         cache_name: str,
         urls: List[str],
         *,
@@ -132,36 +297,90 @@ class Command(BaseCommand):
         use_cache: bool,
         force: bool,
         skip_download: bool,
-    ) -> str:
+    ) -> Optional[Path]:
+        """
+        Make sure the CSV is available to read and return its cache path.
+        Returns None with --no_cache: the HTTP body is then parsed as it arrives (see _open_source).
+        """
+        self.stdout.write(f"{label}: preparing data...")
         cache_path = CACHE_DIR / cache_name
 
         if use_cache and cache_path.exists() and (skip_download or not force):
-            self.stdout.write(f"  using cache: {cache_path}")
-            return cache_path.read_text(encoding="utf-8", errors="replace")
+            self.stdout.write(f"  {label}: using cache: {cache_path}")
+            return cache_path
 
         if skip_download:
             raise RuntimeError(f"Cache file not found but --skip_download_* was set: {cache_path}")
 
-        self.stdout.write("  downloading...")
-        text = _download_text(urls, timeout=timeout)
-
-        if use_cache:
-            cache_path.write_text(text, encoding="utf-8")
-            self.stdout.write(f"  saved cache: {cache_path}")
-
-        return text
-
-    @transaction.atomic
-    def import_owid(self, csv_text: str, limit_countries: int = 0):
-        f = io.StringIO(csv_text)
-        reader = csv.DictReader(f)
+        if not use_cache:
+            return None
 
+        self.stdout.write(f"  {label}: downloading...")
+        with _open_stream(urls, timeout=timeout) as resp:
+            # Write to a temp name first so an interrupted download never becomes the cache
+            part_path = cache_path.with_name(cache_path.name + ".part")
+            with part_path.open("wb") as out:
+                shutil.copyfileobj(resp.raw, out)
+            part_path.replace(cache_path)
+        self.stdout.write(f"  {label}: saved cache: {cache_path}")
+        return cache_path
+
+    @contextmanager
+    def _open_source(self, cache_path: Optional[Path], urls: List[str], *, timeout: int) -> Iterator[TextIO]:
+        """Yield the CSV as a text stream (cache file, or the live download) without loading it into memory."""
+        if cache_path is not None:
+            with cache_path.open(encoding="utf-8", errors="replace", newline="") as f:
+                yield f
+            return
+
+        self.stdout.write("  streaming download...")
+        with _open_stream(urls, timeout=timeout) as resp:
+            # urllib3 otherwise closes the body at EOF, before TextIOWrapper is done with it
+            resp.raw.auto_close = False
+            yield io.TextIOWrapper(resp.raw, encoding="utf-8", errors="replace", newline="")
+
+    def import_owid(self, csv_file: TextIO, limit_countries: int = 0):
+        reader = csv.reader(csv_file)
+
+        # Resolve the handful of columns we use once; the OWID file has 60+.
+        header = next(reader, [])
+        i_iso = _column_index(header, "iso_code")
+        i_name = _column_index(header, "location")
+        i_date = _column_index(header, "date")
+        i_pop = _column_index(header, "population")
+        if i_iso is None or i_date is None:
+            raise RuntimeError("OWID CSV is missing the iso_code/date columns")
+        metric_columns = [
+            (field, i) for field, column in OWID_METRIC_COLUMNS.items() if (i := _column_index(header, column)) is not None
+        ]
+        metric_fields = [field for field, _ in metric_columns]
+        metric_cells = _cell_getter([i for _, i in metric_columns])
+        # Rows only need to reach the last column read; trailing columns may be cut off
+        min_len = max(i for i in (i_iso, i_name, i_date, i_pop, *(i for _, i in metric_columns)) if i is not None) + 1
+
+        countries = {c.iso_code: c for c in Country.objects.all()}
+        new_countries: List[Country] = []
+        changed_countries: Dict[int, Country] = {}
         seen_countries = set()
         count_rows = 0
+        batch: List[tuple] = []
+
+        def flush():
+            # One short transaction per batch instead of one spanning the whole file.
+            # Countries first seen in this batch need their ids before the metric rows can reference them.
+            with transaction.atomic():
+                _create_countries(new_countries)
+                _upsert_rows(DailyMetric, metric_fields, [(c.id, *values) for c, *values in batch])
+            batch.clear()
+
+        # Hot helpers as locals: the loop body runs once per CSV row
+        parse_date, to_float = _parse_date, _to_float
 
         for row in reader:
-            iso = row.get("iso_code")
-            name = row.get("location")
+            if len(row) < min_len:
+                continue
+            iso = row[i_iso]
+            name = row[i_name] if i_name is not None else ""
 
             # Skip aggregates like OWID_WRL, OWID_*
             if not iso or iso.startswith("OWID_"):
@@ -170,12 +389,16 @@ class Command(BaseCommand):
             if limit_countries and iso not in seen_countries and len(seen_countries) >= limit_countries:
                 continue
 
-            pop = _to_float(row.get("population"))
-            d = _parse_date(row.get("date") or "")
+            pop = to_float(row[i_pop]) if i_pop is not None else None
+            d = parse_date(row[i_date])
             if not d:
                 continue
 
-            country, _ = Country.objects.get_or_create(iso_code=iso, defaults={"name": name or iso})
+            country = countries.get(iso)
+            if country is None:
+                # Created in bulk by the next flush()
+                country = countries[iso] = Country(iso_code=iso, name=name or iso)
+                new_countries.append(country)
             changed = False
             if name and country.name != name:
                 country.name = name
@@ -183,43 +406,63 @@ class Command(BaseCommand):
             if pop and (not country.population or country.population != pop):
                 country.population = pop
                 changed = True
-            if changed:
-                country.save()
+            if changed and country.pk is not None:
+                changed_countries[country.pk] = country
 
             seen_countries.add(iso)
 
-            DailyMetric.objects.update_or_create(
-                country=country,
-                date=d,
-                defaults={
-                    "new_cases_smoothed": _to_float(row.get("new_cases_smoothed")),
-                    "new_deaths_smoothed": _to_float(row.get("new_deaths_smoothed")),
-                    "total_cases": _to_float(row.get("total_cases")),
-                    "total_deaths": _to_float(row.get("total_deaths")),
-                    "cases_per_million": _to_float(row.get("new_cases_smoothed_per_million")),
-                    "deaths_per_million": _to_float(row.get("new_deaths_smoothed_per_million")),
-                    "total_vaccinations_per_hundred": _to_float(row.get("total_vaccinations_per_hundred")),
-                    "people_fully_vaccinated_per_hundred": _to_float(row.get("people_fully_vaccinated_per_hundred")),
-                },
-            )
+            batch.append((country, d, *map(to_float, metric_cells(row))))
+            if len(batch) >= UPSERT_BATCH_SIZE:
+                flush()
 
             count_rows += 1
             if count_rows % 200000 == 0:
                 self.stdout.write(f"  processed {count_rows} rows...")
 
-        self.stdout.write(self.style.SUCCESS(f"OWID import complete. Rows: {count_rows}, Countries: {len(seen_countries)}"))
+        flush()
+        Country.objects.bulk_update(changed_countries.values(), ["name", "population"], batch_size=500)
 
-    @transaction.atomic
-    def import_oxcgrt(self, csv_text: str, limit_countries: int = 0):
-        f = io.StringIO(csv_text)
-        reader = csv.DictReader(f)
+        self.stdout.write(self.style.SUCCESS(f"OWID import complete. Rows: {count_rows}, Countries: {len(seen_countries)}"))
 
+    def import_oxcgrt(self, csv_file: TextIO, limit_countries: int = 0):
+        reader = csv.reader(csv_file)
+
+        header = next(reader, [])
+        i_iso = _column_index(header, "CountryCode", "country_code", "ISO3")
+        i_name = _column_index(header, "CountryName", "country_name", "Country")
+        i_date = _column_index(header, "Date", "date")
+        if i_name is None or i_date is None:
+            raise RuntimeError("OxCGRT CSV is missing the country name/date columns")
+        policy_columns = [
+            (field, i, _to_float if field == "stringency_index" else _to_int)
+            for field, names in OXCGRT_POLICY_COLUMNS.items()
+            if (i := _column_index(header, *names)) is not None
+        ]
+        policy_fields = [field for field, _, _ in policy_columns]
+        policy_converters = [convert for _, _, convert in policy_columns]
+        policy_cells = _cell_getter([i for _, i, _ in policy_columns])
+        min_len = max(i for i in (i_iso, i_name, i_date, *(i for _, i, _ in policy_columns)) if i is not None) + 1
+
+        countries = {c.iso_code: c for c in Country.objects.all()}
+        new_countries: List[Country] = []
+        changed_countries: Dict[int, Country] = {}
         seen_countries = set()
         count_rows = 0
+        batch: List[tuple] = []
+
+        def flush():
+            with transaction.atomic():
+                _create_countries(new_countries)
+                _upsert_rows(PolicyDaily, policy_fields, [(c.id, *values) for c, *values in batch])
+            batch.clear()
+
+        parse_date = _parse_date
 
         for row in reader:
-            iso = (row.get("CountryCode") or row.get("country_code") or row.get("ISO3") or "").strip()
-            name = (row.get("CountryName") or row.get("country_name") or row.get("Country") or "").strip()
+            if len(row) < min_len:
+                continue
+            iso = row[i_iso].strip() if i_iso is not None else ""
+            name = row[i_name].strip()
             if not name:
                 continue
 
@@ -229,92 +472,78 @@ class Command(BaseCommand):
             if limit_countries and iso not in seen_countries and len(seen_countries) >= limit_countries:
                 continue
 
-            d = _parse_date(row.get("Date") or row.get("date") or "")
+            d = parse_date(row[i_date])
             if not d:
                 continue
 
-            country, _ = Country.objects.get_or_create(iso_code=iso, defaults={"name": name})
+            country = countries.get(iso)
+            if country is None:
+                # Created in bulk by the next flush()
+                country = countries[iso] = Country(iso_code=iso, name=name)
+                new_countries.append(country)
             if name and country.name != name:
                 country.name = name
-                country.save()
+                if country.pk is not None:
+                    changed_countries[country.pk] = country
 
             seen_countries.add(iso)
 
-            def g(*keys):
-                for k in keys:
-                    if k in row and row.get(k) not in (None, ""):
-                        return row.get(k)
-                return None
-
-            PolicyDaily.objects.update_or_create(
-                country=country,
-                date=d,
-                defaults={
-                    "stringency_index": _to_float(g("StringencyIndex", "stringency_index")),
-                    "c1_school_closing": _to_int(g("C1_School closing", "c1_school_closing", "C1_School_Closing")),
-                    "c2_workplace_closing": _to_int(g("C2_Workplace closing", "c2_workplace_closing", "C2_Workplace_Closing")),
-                    "c6_stay_at_home": _to_int(g("C6_Stay at home requirements", "c6_stay_at_home", "C6_Stay_at_home_requirements")),
-                    "c8_international_travel_controls": _to_int(g("C8_International travel controls", "c8_international_travel_controls", "C8_International_travel_controls")),
-                    "h6_facial_coverings": _to_int(g("H6_Facial Coverings", "h6_facial_coverings", "H6_Facial_Coverings")),
-                },
-            )
+            batch.append((country, d, *[convert(v) for convert, v in zip(policy_converters, policy_cells(row))]))
+            if len(batch) >= UPSERT_BATCH_SIZE:
+                flush()
 
             count_rows += 1
             if count_rows % 200000 == 0:
                 self.stdout.write(f"  processed {count_rows} rows...")
 
+        flush()
+        Country.objects.bulk_update(changed_countries.values(), ["name"], batch_size=500)
+
         self.stdout.write(self.style.SUCCESS(f"OxCGRT import complete. Rows: {count_rows}, Countries: {len(seen_countries)}"))
 
         self.stdout.write("Generating policy events (diffs)...")
         self.generate_policy_events(seen_countries)
 
+    @transaction.atomic
     def generate_policy_events(self, iso_codes: Iterable[str]):
-        for iso in iso_codes:
-            try:
-                country = Country.objects.get(iso_code=iso)
-            except Country.DoesNotExist:
-                continue
+        countries = list(Country.objects.filter(iso_code__in=list(iso_codes)).order_by("name"))
+        PolicyEvent.objects.filter(country_id__in=[c.id for c in countries]).delete()
 
-            PolicyEvent.objects.filter(country=country).delete()
+        # Collected across all countries and inserted once at the end
+        events: List[tuple] = []
 
-            qs = PolicyDaily.objects.filter(country=country).order_by("date")
+        for country in countries:
+            events_before = len(events)
+
+            # Plain (date, *indicators) tuples streamed in chunks instead of model instances
+            rows = (
+                PolicyDaily.objects.filter(country=country)
+                .order_by("date")
+                .values_list("date", *POLICY_EVENT_FIELDS)
+                .iterator(chunk_size=10000)
+            )
             prev = None
-            events_created = 0
 
-            for p in qs:
-                if prev is None:
-                    prev = p
+            for cur in rows:
+                # Most days change nothing: one tuple comparison rules them out
+                if prev is None or prev[1:] == cur[1:]:
+                    prev = cur
                     continue
 
-                changes = []
-
-                def diff(label, a, b, *, float_threshold: float = 0.0):
-                    if a == b:
-                        return
-                    if a is None and b is None:
-                        return
-                    if float_threshold and a is not None and b is not None:
-                        try:
-                            if abs(float(b) - float(a)) < float_threshold:
-                                return
-                        except Exception:
-                            pass
-                    changes.append(f"{label}: {a} → {b}")
-
-                diff("Stringency", prev.stringency_index, p.stringency_index, float_threshold=2.0)
-                diff("School closing", prev.c1_school_closing, p.c1_school_closing)
-                diff("Workplace closing", prev.c2_workplace_closing, p.c2_workplace_closing)
-                diff("Stay-at-home", prev.c6_stay_at_home, p.c6_stay_at_home)
-                diff("Intl travel", prev.c8_international_travel_controls, p.c8_international_travel_controls)
-                diff("Face coverings", prev.h6_facial_coverings, p.h6_facial_coverings)
+                changes = [
+                    change
+                    for (label, threshold), a, b in zip(POLICY_EVENT_FIELDS.values(), prev[1:], cur[1:])
+                    if (change := _diff(label, a, b, threshold)) is not None
+                ]
 
                 if changes:
                     text = "; ".join(changes[:3])
                     if len(changes) > 3:
                         text += f" (+{len(changes) - 3} more)"
-                    PolicyEvent.objects.create(country=country, date=p.date, text=text)
-                    events_created += 1
+                    events.append((country.id, cur[0], text))
+
+                prev = cur
 
-                prev = p
+            self.stdout.write(f"  {country.name}: events {len(events) - events_before}")
 
-            self.stdout.write(f"  {country.name}: events {events_created}")
+        _insert_rows(PolicyEvent, ["country", "date", "text"], events)
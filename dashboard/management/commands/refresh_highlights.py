@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.highlights import refresh_highlights
+from dashboard.models import Country
+from dashboard.timeseries import warm_api_cache
+
+
+class Command(BaseCommand):
+    help = "Recompute stored highlights from the imported data and re-render the cached API responses (no download)."
+
+    def handle(self, *args, **opts):
+        self.stdout.write("Refreshing highlights...")
+        written = refresh_highlights(list(Country.objects.order_by("name")))
+        self.stdout.write(f"  highlights written: {written}")
+
+        self.stdout.write("Warming API cache...")
+        self.stdout.write(f"  cached: {warm_api_cache()} countries")
+
+        self.stdout.write(self.style.SUCCESS("Done."))
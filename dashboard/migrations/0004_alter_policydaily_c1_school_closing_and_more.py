@@ -0,0 +1,38 @@
+# Generated by Django 4.2.27 on 2026-10-15 06:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0003_remove_dailymetric_new_vaccinations_smoothed_per_million_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='policydaily',
+            name='c1_school_closing',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='policydaily',
+            name='c2_workplace_closing',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='policydaily',
+            name='c6_stay_at_home',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='policydaily',
+            name='c8_international_travel_controls',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='policydaily',
+            name='h6_facial_coverings',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.27 on 2026-10-15 06:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0004_alter_policydaily_c1_school_closing_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='dailymetric',
+            name='dashboard_d_country_7a079c_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='policydaily',
+            name='dashboard_p_country_f5df1b_idx',
+        ),
+        migrations.AddIndex(
+            model_name='dailymetric',
+            index=models.Index(fields=['country', 'date'], include=('new_cases_smoothed', 'new_deaths_smoothed', 'cases_per_million', 'deaths_per_million', 'total_vaccinations_per_hundred', 'people_fully_vaccinated_per_hundred'), name='dm_covering_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='policydaily',
+            index=models.Index(fields=['country', 'date'], include=('stringency_index', 'c1_school_closing', 'c2_workplace_closing', 'c6_stay_at_home', 'c8_international_travel_controls', 'h6_facial_coverings'), name='pd_covering_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.27 on 2026-10-15 06:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0005_remove_dailymetric_dashboard_d_country_7a079c_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Highlight',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('type', models.CharField(max_length=20)),
+                ('title', models.CharField(max_length=200)),
+                ('details', models.JSONField(default=list)),
+                ('country', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='highlights', to='dashboard.country')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['country', 'date'], name='dashboard_h_country_d9c700_idx')],
+            },
+        ),
+    ]
@@ -12,6 +12,7 @@ class Country(models.Model):
 
 class DailyMetric(models.Model):
     country = models.ForeignKey(Country, on_delete=models.CASCADE, related_name="metrics")
+    # Standalone date index for the admin date_hierarchy, which filters without a country
     date = models.DateField(db_index=True)
 
     # OWID (smoothed)
@@ -32,7 +33,21 @@ class DailyMetric(models.Model):
 
     class Meta:
         unique_together = ("country", "date")
-        indexes = [models.Index(fields=["country", "date"])]
+        # Covers the per-country timeseries read (PostgreSQL; other backends get a plain index)
+        indexes = [
+            models.Index(
+                fields=["country", "date"],
+                include=[
+                    "new_cases_smoothed",
+                    "new_deaths_smoothed",
+                    "cases_per_million",
+                    "deaths_per_million",
+                    "total_vaccinations_per_hundred",
+                    "people_fully_vaccinated_per_hundred",
+                ],
+                name="dm_covering_idx",
+            )
+        ]
 
     def __str__(self):
         return f"{self.country.iso_code} {self.date}"
@@ -40,19 +55,34 @@ class DailyMetric(models.Model):
 
 class PolicyDaily(models.Model):
     country = models.ForeignKey(Country, on_delete=models.CASCADE, related_name="policies")
+    # Standalone date index for the admin date_hierarchy, which filters without a country
     date = models.DateField(db_index=True)
 
-    # OxCGRT indicators (selected)
+    # OxCGRT indicators (selected); the ordinal ones are small 0–4 levels
     stringency_index = models.FloatField(null=True, blank=True)
-    c1_school_closing = models.IntegerField(null=True, blank=True)
-    c2_workplace_closing = models.IntegerField(null=True, blank=True)
-    c6_stay_at_home = models.IntegerField(null=True, blank=True)
-    c8_international_travel_controls = models.IntegerField(null=True, blank=True)
-    h6_facial_coverings = models.IntegerField(null=True, blank=True)
+    c1_school_closing = models.PositiveSmallIntegerField(null=True, blank=True)
+    c2_workplace_closing = models.PositiveSmallIntegerField(null=True, blank=True)
+    c6_stay_at_home = models.PositiveSmallIntegerField(null=True, blank=True)
+    c8_international_travel_controls = models.PositiveSmallIntegerField(null=True, blank=True)
+    h6_facial_coverings = models.PositiveSmallIntegerField(null=True, blank=True)
 
     class Meta:
         unique_together = ("country", "date")
-        indexes = [models.Index(fields=["country", "date"])]
+        # Covers the timeseries read and the event-diff scan (PostgreSQL; other backends get a plain index)
+        indexes = [
+            models.Index(
+                fields=["country", "date"],
+                include=[
+                    "stringency_index",
+                    "c1_school_closing",
+                    "c2_workplace_closing",
+                    "c6_stay_at_home",
+                    "c8_international_travel_controls",
+                    "h6_facial_coverings",
+                ],
+                name="pd_covering_idx",
+            )
+        ]
 
     def __str__(self):
         return f"Policy {self.country.iso_code} {self.date}"
@@ -68,3 +98,19 @@ class PolicyEvent(models.Model):
 
     def __str__(self):
         return f"Event {self.country.iso_code} {self.date}: {self.text}"
+
+
+class Highlight(models.Model):
+    """Auto-detected "pause point" on a country's timeline, materialized by the import command."""
+
+    country = models.ForeignKey(Country, on_delete=models.CASCADE, related_name="highlights")
+    date = models.DateField()
+    type = models.CharField(max_length=20)
+    title = models.CharField(max_length=200)
+    details = models.JSONField(default=list)
+
+    class Meta:
+        indexes = [models.Index(fields=["country", "date"])]
+
+    def __str__(self):
+        return f"Highlight {self.country.iso_code} {self.date}: {self.title}"
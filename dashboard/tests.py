@@ -1,3 +1,182 @@
-from django.test import TestCase
+import io
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from .highlights import compute_highlights, detect_highlights
+from .management.commands import import_covid_data
+from .models import Country, DailyMetric, Highlight, PolicyDaily, PolicyEvent
+from .timeseries import TIMESERIES_COLUMNS
+
+START = date(2021, 1, 1)
+
+
+def make_rows(**series):
+    """Timeseries row tuples (see TIMESERIES_COLUMNS) from per-column value lists; other columns are None."""
+    days = max(len(values) for values in series.values())
+    return [
+        tuple(START + timedelta(days=i) if col == "date" else series.get(col, [None] * days)[i] for col in TIMESERIES_COLUMNS)
+        for i in range(days)
+    ]
+
+
+def vax_milestones(values):
+    rows = make_rows(people_fully_vaccinated_per_hundred=values)
+    return [(h.date, h.title) for h in detect_highlights(rows) if h.type == "vax"]
+
+
+class VaxMilestoneTests(SimpleTestCase):
+    def test_crossing_between_adjacent_days(self):
+        self.assertEqual(vax_milestones([5, 9, 12]), [(START + timedelta(days=2), "Vaccination milestone: 10% fully vaccinated")])
+
+    def test_crossing_across_reporting_gap(self):
+        self.assertEqual(
+            vax_milestones([5, None, None, 12]),
+            [(START + timedelta(days=3), "Vaccination milestone: 10% fully vaccinated")],
+        )
+
+    def test_downward_revision_does_not_repeat_milestone(self):
+        self.assertEqual(
+            vax_milestones([5, 12, 8, 11]),
+            [(START + timedelta(days=1), "Vaccination milestone: 10% fully vaccinated")],
+        )
+
+    def test_first_report_above_threshold_is_not_a_milestone(self):
+        self.assertEqual(vax_milestones([15, 8, 12]), [])
+
+
+class AccelerationTests(SimpleTestCase):
+    # Two flat weeks at 100 followed by a week at 200: the window ending on day 20 doubles
+    # the one ending on day 13
+    BASE = [100.0] * 14 + [200.0] * 7
+    DAY_20 = START + timedelta(days=20)
+
+    def case_dates(self, values):
+        rows = make_rows(new_cases_smoothed=values)
+        return [h.date for h in detect_highlights(rows) if h.type == "cases"]
+
+    def test_full_weeks_accelerate(self):
+        self.assertIn(self.DAY_20, self.case_dates(self.BASE))
+
+    def test_prior_week_with_five_reported_days_is_averaged(self):
+        values = list(self.BASE)
+        values[7] = values[8] = None
+        self.assertIn(self.DAY_20, self.case_dates(values))
+
+    def test_prior_week_with_four_reported_days_is_skipped(self):
+        values = list(self.BASE)
+        values[7] = values[8] = values[9] = None
+        self.assertNotIn(self.DAY_20, self.case_dates(values))
+
+
+class ComputeHighlightsTests(TestCase):
+    def setUp(self):
+        self.country = Country.objects.create(iso_code="TST", name="Testland")
+        # 10% is crossed on day 2 and 25% on day 5
+        vax = [5, 8, 11, 15, 20, 26]
+        DailyMetric.objects.bulk_create(
+            DailyMetric(country=self.country, date=START + timedelta(days=i), people_fully_vaccinated_per_hundred=v)
+            for i, v in enumerate(vax)
+        )
+
+    def stored(self):
+        return list(Highlight.objects.filter(country=self.country).order_by("date").values_list("date", "title"))
+
+    def test_full_recompute(self):
+        self.assertEqual(compute_highlights(self.country), 2)
+        self.assertEqual(
+            self.stored(),
+            [
+                (START + timedelta(days=2), "Vaccination milestone: 10% fully vaccinated"),
+                (START + timedelta(days=5), "Vaccination milestone: 25% fully vaccinated"),
+            ],
+        )
+
+
+
+OWID_CSV = """iso_code,continent,location,date,total_cases,new_cases_smoothed,total_deaths,new_deaths_smoothed,new_cases_smoothed_per_million,new_deaths_smoothed_per_million,total_vaccinations_per_hundred,people_fully_vaccinated_per_hundred,population
+IDN,Asia,Indonesia,2021-01-01,100,10.5,5,1.0,0.04,0.004,,,273523621
+IDN,Asia,Indonesia,2021-01-02,120,12.0,6,1.2,0.05,0.005,0.1,,273523621
+IDN,Asia,Indonesia,2021-01-03,150,14.5,8,1.5,0.06,0.006,0.3,0.1,273523621
+OWID_WRL,,World,2021-01-01,1000,500.0,50,10.0,,,,,7900000000
+"""
+
+OXCGRT_CSV = """CountryName,CountryCode,Date,C1_School closing,C2_Workplace closing,C6_Stay at home requirements,C8_International travel controls,H6_Facial Coverings,StringencyIndex
+Indonesia,IDN,20210101,0,1,0,3,2,10.0
+Indonesia,IDN,20210102,2,1,0,3,2,30.0
+Indonesia,IDN,20210103,2,1,0,3,2,30.5
+"""
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class ImportCommandTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cache_dir = Path(tmp.name)
+        (cache_dir / "owid-covid-data.csv").write_text(OWID_CSV, encoding="utf-8")
+        (cache_dir / "oxcgrt-latest.csv").write_text(OXCGRT_CSV, encoding="utf-8")
+        self.cache_dir = cache_dir
+        patcher = mock.patch.object(import_covid_data, "CACHE_DIR", cache_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_import(self):
+        call_command("import_covid_data", "--all", "--skip_download_owid", "--skip_download_oxcgrt", stdout=io.StringIO())
+
+    def snapshot(self):
+        return (
+            list(Country.objects.order_by("iso_code").values_list("iso_code", "name", "population")),
+            list(
+                DailyMetric.objects.order_by("date").values_list(
+                    "country__iso_code", "date", "new_cases_smoothed", "total_deaths", "people_fully_vaccinated_per_hundred"
+                )
+            ),
+            list(
+                PolicyDaily.objects.order_by("date").values_list(
+                    "country__iso_code", "date", "stringency_index", "c1_school_closing", "h6_facial_coverings"
+                )
+            ),
+            list(PolicyEvent.objects.order_by("date").values_list("country__iso_code", "date", "text")),
+        )
+
+    def test_import(self):
+        self.run_import()
+        countries, metrics, policies, events = self.snapshot()
+
+        self.assertEqual(countries, [("IDN", "Indonesia", 273523621.0)])
+        self.assertEqual(
+            metrics,
+            [
+                ("IDN", date(2021, 1, 1), 10.5, 5.0, None),
+                ("IDN", date(2021, 1, 2), 12.0, 6.0, None),
+                ("IDN", date(2021, 1, 3), 14.5, 8.0, 0.1),
+            ],
+        )
+        self.assertEqual(
+            policies,
+            [
+                ("IDN", date(2021, 1, 1), 10.0, 0, 2),
+                ("IDN", date(2021, 1, 2), 30.0, 2, 2),
+                ("IDN", date(2021, 1, 3), 30.5, 2, 2),
+            ],
+        )
+        # The 0.5 stringency step on day 3 is below the event threshold
+        self.assertEqual(events, [("IDN", date(2021, 1, 2), "Stringency: 10.0 → 30.0; School closing: 0 → 2")])
+
+    def test_reimport_is_idempotent(self):
+        self.run_import()
+        first = self.snapshot()
+        self.run_import()
+        self.assertEqual(self.snapshot(), first)
+
+    def test_rows_missing_unused_trailing_columns_are_imported(self):
+        lines = OWID_CSV.splitlines()
+        lines[0] += ",tests_units"
+        (self.cache_dir / "owid-covid-data.csv").write_text("\n".join(lines) + "\n", encoding="utf-8")
+        self.run_import()
+        self.assertEqual(DailyMetric.objects.filter(country__iso_code="IDN").count(), 3)
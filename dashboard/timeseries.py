@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import date
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.db.models import Exists, OuterRef
+from django.utils.cache import quote_etag
+
+from .models import Country, DailyMetric, Highlight, PolicyDaily, PolicyEvent
+
+
+# OxCGRT ordinal indicators served per day, with their display labels
+POLICY_LABELS: Dict[str, str] = {
+    "c1_school_closing": "School closing",
+    "c2_workplace_closing": "Workplace closing",
+    "c6_stay_at_home": "Stay-at-home requirements",
+    "c8_international_travel_controls": "International travel controls",
+    "h6_facial_coverings": "Facial coverings",
+}
+
+# DailyMetric columns served by the timeseries API
+METRIC_FIELDS = (
+    "new_cases_smoothed",
+    "new_deaths_smoothed",
+    "cases_per_million",
+    "deaths_per_million",
+    "people_fully_vaccinated_per_hundred",
+    "total_vaccinations_per_hundred",
+)
+
+# Ordinal indicator columns, in display order
+POLICY_KEYS = tuple(POLICY_LABELS)
+
+# PolicyDaily columns joined onto each metrics day
+POLICY_FIELDS = ("stringency_index", *POLICY_KEYS)
+
+# Column order of the tuples returned by timeseries_rows
+TIMESERIES_COLUMNS = ("date", *METRIC_FIELDS, "policy_id", *POLICY_FIELDS)
+
+# Part of every cache key: the file cache outlives deploys, so bump this whenever the shape of a
+# cached response changes and entries rendered by older code are never served
+PAYLOAD_VERSION = 1
+
+# Imports re-render every cached response; the TTL only bounds staleness from other writes
+TIMESERIES_CACHE_SECONDS = 60 * 60 * 24
+
+# The country list only changes when an import adds a country, and imports re-render it
+COUNTRIES_CACHE_KEY = f"countries:v{PAYLOAD_VERSION}"
+COUNTRIES_CACHE_SECONDS = 60 * 60 * 6
+
+
+def _iso(d: date) -> str:
+    return d.isoformat()
+
+
+def encode_json(payload: Dict[str, Any]) -> bytes:
+    """Compact UTF-8 JSON body, encoded once so cached responses are sent as-is."""
+    return json.dumps(payload, cls=DjangoJSONEncoder, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def timeseries_rows(country: Country) -> List[tuple]:
+    """
+    One TIMESERIES_COLUMNS tuple per OWID metrics day, with that day's OxCGRT columns LEFT JOINed on
+    (country, date) so metrics and policies come back already aligned. `policy_id` is None on days
+    without a policy row.
+    """
+    qn = connection.ops.quote_name
+    metric_cols = ", ".join(f"m.{qn(f)}" for f in ("date", *METRIC_FIELDS))
+    policy_cols = ", ".join(f"p.{qn(f)}" for f in POLICY_FIELDS)
+    sql = (
+        f"SELECT {metric_cols}, p.{qn('id')} AS policy_id, {policy_cols} "
+        f"FROM {qn(DailyMetric._meta.db_table)} m "
+        f"LEFT JOIN {qn(PolicyDaily._meta.db_table)} p "
+        f"ON p.{qn('country_id')} = m.{qn('country_id')} AND p.{qn('date')} = m.{qn('date')} "
+        f"WHERE m.{qn('country_id')} = %s "
+        f"ORDER BY m.{qn('date')}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [country.pk])
+        return cursor.fetchall()
+
+
+def timeseries_cache_key(country: Country) -> str:
+    return f"ts:v{PAYLOAD_VERSION}:{country.iso_code}"
+
+
+def render_timeseries(country: Country) -> Tuple[str, bytes]:
+    """Encoded timeseries body and its ETag, a hash of the body itself so any data change alters it."""
+    body = encode_json(timeseries_payload(country))
+    return quote_etag(hashlib.sha1(body).hexdigest()), body
+
+
+def cached_timeseries(country: Country) -> Tuple[str, bytes]:
+    """(etag, body) for the country, rendered on a cache miss."""
+    return cache.get_or_set(timeseries_cache_key(country), lambda: render_timeseries(country), TIMESERIES_CACHE_SECONDS)
+
+
+def warm_timeseries_cache(country: Country) -> None:
+    """Re-render the country's cached response (called after imports, which may revise any day)."""
+    cache.set(timeseries_cache_key(country), render_timeseries(country), TIMESERIES_CACHE_SECONDS)
+
+
+def countries_payload() -> Dict[str, Any]:
+    """The /api/countries/ JSON document."""
+    # Only countries that actually have OWID metrics (so charts won't be empty); a semi-join
+    # stops at the first metric row per country instead of joining and de-duplicating all of them
+    countries = (
+        Country.objects.filter(Exists(DailyMetric.objects.filter(country_id=OuterRef("pk"))))
+        .order_by("name")
+        .values("iso_code", "name")
+    )
+    return {"countries": list(countries)}
+
+
+def cached_countries() -> bytes:
+    """Encoded country list, rendered on a cache miss."""
+    return cache.get_or_set(COUNTRIES_CACHE_KEY, lambda: encode_json(countries_payload()), COUNTRIES_CACHE_SECONDS)
+
+
+def warm_countries_cache() -> None:
+    """Re-render the cached country list (called after imports, which may add countries)."""
+    cache.set(COUNTRIES_CACHE_KEY, encode_json(countries_payload()), COUNTRIES_CACHE_SECONDS)
+
+
+def warm_api_cache() -> int:
+    """Re-render every country's timeseries response and the country list. Returns the number of countries."""
+    countries = Country.objects.filter(Exists(DailyMetric.objects.filter(country_id=OuterRef("pk"))))
+    for country in countries:
+        warm_timeseries_cache(country)
+    warm_countries_cache()
+    return len(countries)
+
+
+def timeseries_payload(country: Country) -> Dict[str, Any]:
+    """The /api/timeseries/<iso>/ JSON document for one country."""
+    # --- Metrics (OWID) + policies (OxCGRT), aligned on date by the database ---
+    # Transposed into one tuple per column by zip in C; the column tuples are served as the series
+    # directly, and each day is formatted exactly once
+    columns = dict(zip(TIMESERIES_COLUMNS, zip(*timeseries_rows(country))))
+    day_col = columns.get("date", ())
+    dates: List[str] = list(map(date.isoformat, day_col))
+
+    series: Dict[str, Sequence[Optional[float]]] = {
+        key: columns.get(column, ())
+        for key, column in (
+            ("cases", "new_cases_smoothed"),
+            ("deaths", "new_deaths_smoothed"),
+            ("cases_pm", "cases_per_million"),
+            ("deaths_pm", "deaths_per_million"),
+            ("vax_full", "people_fully_vaccinated_per_hundred"),
+            ("vax_total", "total_vaccinations_per_hundred"),
+            ("stringency", "stringency_index"),
+            ("school", "c1_school_closing"),
+            ("work", "c2_workplace_closing"),
+            ("stayhome", "c6_stay_at_home"),
+            ("travel", "c8_international_travel_controls"),
+            ("masks", "h6_facial_coverings"),
+        )
+    }
+
+    # --- Events (policy diffs from PolicyEvent table) ---
+    # Only days that have events are sent; the frontend looks them up by date
+    events_payload: List[Dict[str, Any]] = []
+    if day_col:
+        events_qs = (
+            PolicyEvent.objects.filter(country=country, date__range=(day_col[0], day_col[-1]))
+            .order_by("date", "id")
+            .values_list("date", "text")
+        )
+        events_payload = [
+            {"date": _iso(d), "items": [text for _, text in group]} for d, group in groupby(events_qs, key=itemgetter(0))
+        ]
+
+    # --- Highlights (precomputed by the import, see highlights.compute_highlights) ---
+    highlights = [
+        {**h, "date": _iso(h["date"])}
+        for h in Highlight.objects.filter(country=country).order_by("date", "id").values("date", "type", "title", "details")
+    ]
+
+    return {
+        "country": {"iso_code": country.iso_code, "name": country.name, "population": country.population},
+        "dates": dates,
+        "series": series,
+        "events": events_payload,
+        "highlights": highlights,
+    }
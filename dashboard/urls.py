@@ -3,6 +3,7 @@ from . import views
 
 urlpatterns = [
     path("", views.index, name="dashboard_index"),
+    path("api/meta/", views.api_meta, name="api_meta"),
     path("api/countries/", views.api_countries, name="api_countries"),
     path("api/timeseries/<str:iso_code>/", views.api_timeseries, name="api_timeseries"),
 ]